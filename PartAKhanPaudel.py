@@ -1,214 +1,283 @@
-def load_authors(conn, csv_path):
+BATCH_SIZE = 10000
+
+# Uniqueness constraints on the IDs the loaders MERGE on. Besides backing the
+# lookups, they make every loader idempotent, so a replayed batch is harmless.
+ID_CONSTRAINTS = {
+    "Author": "authorID",
+    "Paper": "paperID",
+    "Year": "year",
+    "Journal": "journalID",
+    "Volume": "volID",
+    "Conference": "conferenceID",
+    "Workshop": "workshopID",
+    "Proceedings": "proceedingsID",
+    "Organization": "orgID",
+}
+
+
+def create_constraints(conn, tracker=None):
+    for label, key in ID_CONSTRAINTS.items():
+        query = f"""CREATE CONSTRAINT {label.lower()}_{key.lower()} IF NOT EXISTS
+        FOR (n:{label}) REQUIRE n.{key} IS UNIQUE"""
+        conn.query(query)
+    conn.query("CALL db.awaitIndexes()")
+    print("Constraints created successfully.")
+
+
+def count_csv_rows(conn, csv_path):
+    # Rows are numbered from linenumber() like in run_csv_batches, minus the header line
     query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    CREATE (:Author {{authorID: row.authorID, name: row.name}});"""
-    conn.query(query)
+    RETURN coalesce(max(linenumber()) - 1, 0) AS rows"""
+    return conn.query(query)[0]["rows"]
+
+
+def run_csv_batches(conn, csv_path, query, tracker=None, batch_size=BATCH_SIZE):
+    # Runs `query` for every CSV row in a single pass over the file, committing
+    # every batch_size rows. The subquery returns the number of the last row of
+    # each full batch once that batch has committed; that row is where a resumed
+    # step restarts. Replaying a batch is harmless since loaders MERGE.
+    full_query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
+    WITH linenumber() - 1 AS number, row
+    WHERE number > $skip
+    CALL {{
+        WITH number, row
+        CALL {{
+            WITH row
+            {query}
+        }}
+        WITH number
+        WHERE number % $batchSize = 0
+        RETURN number AS committed
+    }} IN TRANSACTIONS OF $batchSize ROWS
+    RETURN committed"""
+    skip = 0
+    if tracker is not None:
+        # The row count is an extra pass over the file, so it is only done once per step
+        total = tracker.total if tracker.total is not None else count_csv_rows(conn, csv_path)
+        tracker.begin(total)
+        skip = tracker.rows
+    for record in conn.stream(full_query, {"skip": skip, "batchSize": batch_size}):
+        if tracker is not None:
+            tracker.advance(record["committed"])
+    if tracker is not None:
+        tracker.advance(tracker.total)
+
+
+def load_authors(conn, csv_path, tracker=None):
+    query = """MERGE (a:Author {authorID: row.authorID})
+    SET a.name = row.name"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Authors loaded successfully.")
 
 
-def load_years(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    CREATE (:Year {{
-    year: toInteger(row.year)
-    }});"""
-    conn.query(query)
+def load_years(conn, csv_path, tracker=None):
+    query = """MERGE (:Year {year: toInteger(row.year)})"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Years loaded successfully.")
 
 
-def load_papers(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    MERGE (p:Paper {{
-    paperID: row.paperID,
-    title: row.title,
-    abstract: row.abstract,
-    publicationDate: date(row.publicationDate)
-    }})
-    MERGE (y:Year {{year: toInteger(row.year)}})
-    MERGE (p)-[:IN_YEAR]->(y);
-    """
-    conn.query(query)
+def load_papers(conn, csv_path, tracker=None):
+    query = """MERGE (p:Paper {paperID: row.paperID})
+    SET p.title = row.title,
+    p.abstract = row.abstract,
+    p.publicationDate = date(row.publicationDate)
+    MERGE (y:Year {year: toInteger(row.year)})
+    MERGE (p)-[:IN_YEAR]->(y)"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Papers loaded successfully.")
 
 
-def load_journals(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    CREATE (:Journal {{journalID: row.journalID, name: row.name, 
-    issn: row.issn, editor: row.editor}});"""
-    conn.query(query)
+def load_journals(conn, csv_path, tracker=None):
+    query = """MERGE (j:Journal {journalID: row.journalID})
+    SET j.name = row.name, j.issn = row.issn, j.editor = row.editor"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Journals loaded successfully.")
 
 
-def load_volumes(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    CREATE (:Volume {{
-    volID: row.volID,
-    volNumber: toInteger(row.volNumber),
-    journalID: row.journalID
-    }});"""
-    conn.query(query)
+def load_volumes(conn, csv_path, tracker=None):
+    query = """MERGE (v:Volume {volID: row.volID})
+    SET v.volNumber = toInteger(row.volNumber),
+    v.journalID = row.journalID"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Volumes loaded successfully.")
     query = f"""MATCH (v:Volume), (j:Journal)
     WHERE v.journalID = j.journalID
-    CREATE (v)-[:PRESENTED_IN]->(j);"""
+    MERGE (v)-[:PRESENTED_IN]->(j)"""
     conn.query(query)
     print("Volume PRESENTED_IN Journal relationships loaded successfully.")
 
 
-def load_paper_volume_relationships(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    MATCH (p:Paper {{paperID: row.paperID}})
-    MATCH (v:Volume {{volID: row.volID}})
-    MERGE (p)-[:PUBLISHED_IN]->(v);"""
-    conn.query(query)
+def load_paper_volume_relationships(conn, csv_path, tracker=None):
+    query = """MATCH (p:Paper {paperID: row.paperID})
+    MATCH (v:Volume {volID: row.volID})
+    MERGE (p)-[:PUBLISHED_IN]->(v)"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Paper PUBLISHED_IN Volume relationship loaded successfully.")
 
 
-def load_conferences(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    CREATE (:Conference {{conferenceID: row.conferenceID, 
-    name: row.name, chair: row.chair}});
-    """
-    conn.query(query)
+def load_conferences(conn, csv_path, tracker=None):
+    query = """MERGE (c:Conference {conferenceID: row.conferenceID})
+    SET c.name = row.name, c.chair = row.chair"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Conferences loaded successfully.")
 
 
-def load_workshops(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    CREATE (:Workshop {{workshopID: row.workshopID, name: row.name, 
-                   chair: row.chair}});"""
-    conn.query(query)
+def load_workshops(conn, csv_path, tracker=None):
+    query = """MERGE (w:Workshop {workshopID: row.workshopID})
+    SET w.name = row.name, w.chair = row.chair"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Workshops loaded successfully.")
 
 
-def load_proceedings(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    CREATE (:Proceedings {{
-    proceedingsID: row.proceedingsID,
-    edition: row.edition,
-    conferenceID: row.conferenceID,
-    type: row.type,
-    venue: row.venue,
-    startDate: date(row.startDate),
-    endDate: date(row.endDate)
-    }});"""
-    conn.query(query)
+def load_proceedings(conn, csv_path, tracker=None):
+    query = """MERGE (p:Proceedings {proceedingsID: row.proceedingsID})
+    SET p.edition = row.edition,
+    p.conferenceID = row.conferenceID,
+    p.type = row.type,
+    p.venue = row.venue,
+    p.startDate = date(row.startDate),
+    p.endDate = date(row.endDate)"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Proceedings loaded successfully.")
     query = f"""MATCH (p:Proceedings {{type: "conference"}}), (c:Conference)
     WHERE p.conferenceID = c.conferenceID
-    CREATE (p)-[:PRESENTED_IN]->(c)"""
+    MERGE (p)-[:PRESENTED_IN]->(c)"""
     conn.query(query)
     print("Proceedings PRESENTED_IN Conference relationships loaded successfully.")
     query = f"""MATCH (p:Proceedings {{type: "workshop"}}), (w:Workshop)
     WHERE p.conferenceID = w.conferenceID
-    CREATE (p)-[:PRESENTED_IN]->(w)"""
+    MERGE (p)-[:PRESENTED_IN]->(w)"""
     conn.query(query)
     print("Proceedings PRESENTED_IN Workshop relationships loaded successfully.")
 
 
-def load_writes(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    MATCH (a:Author {{authorID: row.authorID}})
-    MATCH (p:Paper {{paperID: row.paperID}})
+def load_writes(conn, csv_path, tracker=None):
+    query = """MATCH (a:Author {authorID: row.authorID})
+    MATCH (p:Paper {paperID: row.paperID})
     MERGE (a)-[r:WRITES]->(p)
-    SET r.corresponding = row.corresponds = "True";
-    """
-    conn.query(query)
+    SET r.corresponding = (row.corresponds = "True")"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Author WRITES Paper relationship loaded successfully.")
 
 
-def load_reviews(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    MATCH (reviewingAuthor:Author {{authorID: row.authorID}})
-    MATCH (reviewedPaper:Paper {{paperID: row.paperID}})
-    MERGE (reviewingAuthor)-[:REVIEWS]->(reviewedPaper);"""
-    conn.query(query)
+def load_reviews(conn, csv_path, tracker=None):
+    query = """MATCH (reviewingAuthor:Author {authorID: row.authorID})
+    MATCH (reviewedPaper:Paper {paperID: row.paperID})
+    MERGE (reviewingAuthor)-[:REVIEWS]->(reviewedPaper)"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Author REVIEWS Paper relationship loaded successfully.")
 
 
-def load_cites(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    MATCH (citingPaper:Paper {{paperID: row.paperID}})
-    MATCH (citedPaper:Paper {{paperID: row.referenceID}})
-    MERGE (citingPaper)-[:CITES]->(citedPaper);"""
-    conn.query(query)
+def load_cites(conn, csv_path, tracker=None):
+    query = """MATCH (citingPaper:Paper {paperID: row.paperID})
+    MATCH (citedPaper:Paper {paperID: row.referenceID})
+    MERGE (citingPaper)-[:CITES]->(citedPaper)"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Paper CITES Paper relationship loaded successfully.")
 
 
-def load_paper_proceedings_relationships(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    MATCH (p:Paper {{paperID: row.paperID}})
-    MATCH (pr:Proceedings {{proceedingsID: row.proceedingsID}})
-    MERGE (p)-[:PUBLISHED_IN]->(pr);"""
-    conn.query(query)
+def load_paper_proceedings_relationships(conn, csv_path, tracker=None):
+    query = """MATCH (p:Paper {paperID: row.paperID})
+    MATCH (pr:Proceedings {proceedingsID: row.proceedingsID})
+    MERGE (p)-[:PUBLISHED_IN]->(pr)"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Paper PUBLISHED_IN Proceedings relationships loaded successfully.")
 
 
-def load_keywords(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    CREATE (:Keyword {{
-    keyword: row.keyword
-    }});"""
+def create_keyword_indexes(conn, tracker=None):
+    # Keywords are merged on their normalized key (see keywords.normalize_keyword)
+    query = """CREATE CONSTRAINT keyword_key IF NOT EXISTS
+    FOR (k:Keyword) REQUIRE k.key IS UNIQUE"""
     conn.query(query)
-    print("Keywords loaded successfully.")
+    # Resolves the fuzzy community patterns in PartC
+    query = """CREATE FULLTEXT INDEX keyword_fulltext IF NOT EXISTS
+    FOR (k:Keyword) ON EACH [k.keyword]"""
+    conn.query(query)
+    conn.query("CALL db.awaitIndexes()")
+    print("Keyword indexes created successfully.")
 
 
-def load_paper_keywords_relationships(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row WITH row
-    WHERE row.keywords IS NOT NULL
-    MATCH (p:Paper {{paperID: row.paperId}})
-    MERGE (k:Keyword {{keyword: row.keywords}})
-    MERGE (p)-[:CONTAINS]->(k);
-    """
+def create_paper_fulltext_index(conn, tracker=None):
+    query = """CREATE FULLTEXT INDEX paper_fulltext IF NOT EXISTS
+    FOR (p:Paper) ON EACH [p.title, p.abstract]"""
     conn.query(query)
-    print("Paper-keyword relationships loaded successfully.")
+    conn.query("CALL db.awaitIndexes()")
+    print("Paper full-text index created successfully.")
 
 
-def update_review_details(conn, csv_path):
+def require_key_column(conn, csv_path):
+    # Keys come from keywords.normalize_keyword in the ETL notebook and cannot be
+    # reproduced in Cypher, so CSVs from older ETL runs are rejected outright.
     query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    MATCH (a:Author)-[r:REVIEWS]->(p:Paper)
+    RETURN keys(row) AS columns
+    LIMIT 1"""
+    result = conn.query(query)
+    if result and "key" not in result[0]["columns"]:
+        raise ValueError(f"{csv_path} has no key column; rerun notebooks/etl.ipynb to generate it.")
+
+
+def load_keywords(conn, csv_path, tracker=None):
+    require_key_column(conn, csv_path)
+    query = """WITH row WHERE row.key IS NOT NULL
+    MERGE (k:Keyword {key: row.key})
+    ON CREATE SET k.keyword = row.keyword"""
+    run_csv_batches(conn, csv_path, query, tracker)
+    print("Keywords loaded successfully.")
+
+
+def load_paper_keywords_relationships(conn, csv_path, tracker=None):
+    require_key_column(conn, csv_path)
+    query = """WITH row WHERE row.keywords IS NOT NULL AND row.key IS NOT NULL
+    MATCH (p:Paper {paperID: row.paperId})
+    MERGE (k:Keyword {key: row.key})
+    ON CREATE SET k.keyword = row.keywords
+    MERGE (p)-[:CONTAINS]->(k)"""
+    run_csv_batches(conn, csv_path, query, tracker)
+    print("Paper-keyword relationships loaded successfully.")
+
+
+def update_review_details(conn, csv_path, tracker=None):
+    query = """MATCH (a:Author)-[r:REVIEWS]->(p:Paper)
     WHERE a.authorID = row.authorID AND p.paperID = row.paperID
-    SET r.content = row.content, r.decision = (row.decision = "True");"""
-    conn.query(query)
+    SET r.content = row.content, r.decision = (row.decision = "True")"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Review details updated successfully.")
 
 
-def update_journal_reviewer_policy(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    MATCH (j:Journal)
+def update_journal_reviewer_policy(conn, csv_path, tracker=None):
+    query = """MATCH (j:Journal)
     WHERE j.journalID = row.journalID
-    SET j.reviewerPolicy = row.reviewerPolicy;"""
-    conn.query(query)
+    SET j.reviewerPolicy = row.reviewerPolicy"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Journal reviewer policy updated successfully.")
 
 
-def update_conference_reviewer_policy(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    MATCH (c:Conference)
+def update_conference_reviewer_policy(conn, csv_path, tracker=None):
+    query = """MATCH (c:Conference)
     WHERE c.conferenceID = row.conferenceID
-    SET c.reviewerPolicy = row.reviewerPolicy;"""
-    conn.query(query)
+    SET c.reviewerPolicy = row.reviewerPolicy"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Conference reviewer policy updated successfully.")
 
 
-def update_workshop_reviewer_policy(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    MATCH (w:Workshop)
+def update_workshop_reviewer_policy(conn, csv_path, tracker=None):
+    query = """MATCH (w:Workshop)
     WHERE w.workshopID = row.workshopID
-    SET w.reviewerPolicy = row.reviewerPolicy;"""
-    conn.query(query)
+    SET w.reviewerPolicy = row.reviewerPolicy"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Workshop reviewer policy updated successfully.")
 
 
-def load_organizations(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    CREATE (:Organization {{orgID: row.orgID, name: row.name, type: row.type}});"""
-    conn.query(query)
+def load_organizations(conn, csv_path, tracker=None):
+    query = """MERGE (o:Organization {orgID: row.orgID})
+    SET o.name = row.name, o.type = row.type"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Organizations loaded successfully.")
 
 
-def load_author_affiliations(conn, csv_path):
-    query = f"""LOAD CSV WITH HEADERS FROM '{csv_path}' AS row
-    MATCH (a:Author {{authorID: row.authorID}})
-    MATCH (o:Organization {{orgID: row.affiliation}})
-    MERGE (a)-[:AFFILIATED_TO]->(o);"""
-    conn.query(query)
+def load_author_affiliations(conn, csv_path, tracker=None):
+    query = """MATCH (a:Author {authorID: row.authorID})
+    MATCH (o:Organization {orgID: row.affiliation})
+    MERGE (a)-[:AFFILIATED_TO]->(o)"""
+    run_csv_batches(conn, csv_path, query, tracker)
     print("Author affiliations loaded successfully.")
@@ -1,5 +1,6 @@
 import pandas as pd
 from connection import Neo4jConnection
+import ranking
 import configparser
 import os
 
@@ -29,14 +30,8 @@ def run_query(conn, query):
 
 # Define functions for each query
 def get_top3_papers_per_conference(conn):
-    query = """MATCH (c:Conference)<-[:PRESENTED_IN]-(p:Proceedings {type: "conference"})<-[:PUBLISHED_IN]-(paper:Paper)
-    OPTIONAL MATCH (paper)<-[:CITES]-(citingPaper:Paper)
-    WITH c, paper, COUNT(citingPaper) AS citations
-    ORDER BY citations DESC
-    WITH c.name AS ConferenceName, collect({title: paper.title, citations: citations}) AS papers
-    RETURN ConferenceName, [paper IN papers[0..3] | paper.title] AS Top3Papers, [paper IN papers[0..3] | paper.citations] AS Citations
-    ORDER BY ConferenceName"""
-    return run_query(conn, query)
+    top3_papers_df = ranking.top_cited_papers_per_conference(conn, k=3)
+    return top3_papers_df.rename(columns={"TopPapers": "Top3Papers"})
 
 
 def get_conference_community(conn):
@@ -64,29 +59,33 @@ def get_impact_factors(conn):
 
 
 def get_h_indexes(conn):
-    query = """MATCH (a:Author)-[:WRITES]->(p:Paper)
-    OPTIONAL MATCH (p)<-[:CITES]-(citing:Paper)
-    WITH a, p, COUNT(citing) AS citations
-    ORDER BY citations DESC
-    WITH a, COLLECT(citations) AS citationCounts
-    UNWIND RANGE(1, SIZE(citationCounts)) AS index
-    WITH a, citationCounts, index
-    WHERE citationCounts[index-1] >= index
-    WITH a, MAX(index) AS hIndex
-    RETURN a.name AS Author, hIndex AS HIndex
-    ORDER BY HIndex DESC"""
-    return run_query(conn, query)
+    # Pages seek on the stored hIndexRank, so each one only reads its own authors
+    ranked = conn.query("""MATCH (a:Author)
+    WHERE a.hIndexRank IS NOT NULL
+    RETURN a LIMIT 1""")
+    if not ranked:
+        raise RuntimeError("No stored h-indexes found; run ranking.write_citation_scores first.")
+    pages = list(ranking.iter_pages(ranking.rank_authors_by_h_index, conn))
+    if not pages:
+        return pd.DataFrame(columns=["Author", "HIndex"])
+    return pd.concat(pages, ignore_index=True)[["Author", "HIndex"]]
 
 
 def main():
     config = load_config()
 
     # Connect to Neo4j
+    # Strict, so a failed score refresh stops the run instead of leaving the
+    # rankings empty or stale
     conn = Neo4jConnection(
-        config["uri"], config["user"], config["password"], config["database"]
+        config["uri"], config["user"], config["password"], config["database"],
+        strict=True,
     )
 
     try:
+        # Refresh the stored citation counts and h-indexes the rankings read
+        ranking.write_citation_scores(conn)
+
         # Execute queries
         top3_papers_df = get_top3_papers_per_conference(conn)
         community_df = get_conference_community(conn)
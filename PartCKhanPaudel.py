@@ -1,5 +1,7 @@
 import pandas as pd
 from connection import Neo4jConnection
+from keywords import normalize_keyword
+import PartAKhanPaudel as dlf
 import configparser
 import os
 
@@ -33,13 +35,86 @@ def create_database_community(conn):
     conn.query(create_db_comm)
 
 
-def associate_keywords_with_community(conn):
-    associate_keywords = """UNWIND ['graph', 'graph neural', 'knowledge graphs', 'knowledge graph', 'bipartite graphs', 'graph convolutional'] AS keywordName
-    MERGE (k:Keyword {keyword: keywordName})
-    WITH k
-    MATCH (c:Community {name: 'Graph'})
+def backfill_keyword_keys(conn, batch_size=10000):
+    # Databases loaded before keywords had a key get one from the same normalizer
+    # as the ETL. Keywords that normalize to the same key are merged into one.
+    query = """MATCH (k:Keyword)
+    WHERE k.key IS NULL
+    RETURN elementId(k) AS id, k.keyword AS keyword"""
+    groups = {}
+    for record in conn.query(query):
+        key = normalize_keyword(record["keyword"])
+        if key:
+            groups.setdefault(key, []).append(record["id"])
+    groups = [{"key": key, "ids": ids} for key, ids in groups.items()]
+
+    query = """UNWIND $groups AS group
+    MATCH (k:Keyword)
+    WHERE elementId(k) IN group.ids
+    WITH group, collect(k) AS nodes
+    OPTIONAL MATCH (existing:Keyword {key: group.key})
+    WITH group, nodes, coalesce(existing, nodes[0]) AS keep
+    SET keep.key = group.key
+    WITH keep, [n IN nodes WHERE n <> keep] AS duplicates
+    UNWIND duplicates AS duplicate
+    CALL {
+        WITH keep, duplicate
+        MATCH (p:Paper)-[:CONTAINS]->(duplicate)
+        MERGE (p)-[:CONTAINS]->(keep)
+    }
+    CALL {
+        WITH keep, duplicate
+        MATCH (duplicate)-[:PART_OF]->(c)
+        MERGE (keep)-[:PART_OF]->(c)
+    }
+    DETACH DELETE duplicate;"""
+    for start in range(0, len(groups), batch_size):
+        conn.query(query, {"groups": groups[start:start + batch_size]})
+    if groups:
+        print(f"Backfilled {len(groups)} keyword keys.")
+
+
+# Keywords whose normalized key equals, or starts with, one of these word prefixes
+GRAPH_COMMUNITY_PREFIXES = ['graph']
+# Keywords containing every word of one of these patterns, allowing one typo per word
+GRAPH_COMMUNITY_FUZZY = ['knowledge graph', 'bipartite graph']
+
+
+def fuzzy_search(patterns):
+    # Normalized patterns only contain [a-z0-9 ], so no Lucene escaping is needed
+    clauses = []
+    for pattern in patterns:
+        words = normalize_keyword(pattern).split()
+        if words:
+            clauses.append("(" + " AND ".join(f"{word}~1" for word in words) + ")")
+    return " OR ".join(clauses)
+
+
+def associate_keywords_with_community(
+    conn, prefixes=GRAPH_COMMUNITY_PREFIXES, fuzzy=GRAPH_COMMUNITY_FUZZY
+):
+    # Prefixes are resolved through the keyword_key index, fuzzy patterns
+    # through the keyword_fulltext index, both in a single query.
+    search = fuzzy_search(fuzzy)
+    fuzzy_matches = """
+        UNION
+        CALL db.index.fulltext.queryNodes('keyword_fulltext', $search)
+        YIELD node
+        RETURN node AS k""" if search else ""
+    associate_keywords = f"""CALL {{
+        UNWIND $prefixes AS prefix
+        MATCH (k:Keyword)
+        WHERE k.key STARTS WITH prefix AND (k.key = prefix OR k.key STARTS WITH prefix + ' ')
+        RETURN k{fuzzy_matches}
+    }}
+    WITH DISTINCT k
+    MATCH (c:Community {{name: 'Graph'}})
     MERGE (k)-[:PART_OF]->(c);"""
-    conn.query(associate_keywords)
+    parameters = {
+        "prefixes": [normalize_keyword(prefix) for prefix in prefixes],
+        "search": search,
+    }
+    conn.query(associate_keywords, parameters)
 
 
 def tag_conferences_and_journals(conn):
@@ -95,13 +170,20 @@ def find_potential_reviewers_and_gurus(conn):
 def main():
     config = load_config()
 
+    # Strict, so a failed step stops the run instead of leaving later steps
+    # working on an empty Graph community
     conn = Neo4jConnection(
-        config["uri"], config["user"], config["password"], config["database"]
+        config["uri"], config["user"], config["password"], config["database"],
+        strict=True,
     )
 
     try:
         # Execute the steps for the recommender system
         create_database_community(conn)
+        # Databases loaded by an older loader lack the keyword_key constraint and
+        # keyword_fulltext index that the backfill and association rely on
+        dlf.create_keyword_indexes(conn)
+        backfill_keyword_keys(conn)
         associate_keywords_with_community(conn)
         tagged_journals_df = tag_conferences_and_journals(conn)
         top_cited_papers_df = identify_top_cited_papers(conn)
@@ -3,6 +3,7 @@ from connection import (
     Neo4jConnection,
 )  # Ensure this matches the name of your connection file
 import os
+import ranking
 
 
 def load_config(config_file="config.ini"):
@@ -48,46 +49,36 @@ class GraphAlgorithms:
         self.conn.query(query)
         print(f"Graph '{graph_name}' projected successfully.")
 
-    def run_pagerank(self, graph_name):
-        query = f"""
-        CALL gds.pageRank.stream('{graph_name}')
-        YIELD nodeId, score
-        RETURN gds.util.asNode(nodeId).paperID AS paperID, score
-        ORDER BY score DESC
-        LIMIT 10
-        """
-        results = self.conn.query(query)
+    def write_centrality(self, graph_name, algorithm):
+        # Runs the algorithm once and stores its scores on the papers
+        ranking.write_centrality_scores(self.conn, graph_name, algorithm)
+
+    def rank_centrality(self, algorithm, k=10, **kwargs):
+        # Returns one page of (PaperID, Score) and the cursor of the next page
+        return ranking.rank_papers_by_centrality(self.conn, algorithm, k=k, **kwargs)
+
+    def run_pagerank(self, graph_name, k=10):
+        self.write_centrality(graph_name, "pageRank")
+        results, _ = self.rank_centrality("pageRank", k)
         print("PageRank scores:")
-        for result in results:
-            print(result["paperID"], result["score"])
+        for result in results.itertuples():
+            print(result.PaperID, result.Score)
 
     # Updated run_betweenness method
-    def run_betweenness(self, graph_name):
-        query = f"""
-        CALL gds.betweenness.stream('{graph_name}')
-        YIELD nodeId, score
-        RETURN gds.util.asNode(nodeId).paperID AS paperID, score
-        ORDER BY score DESC
-        LIMIT 10
-        """
-        results = self.conn.query(query)
+    def run_betweenness(self, graph_name, k=10):
+        self.write_centrality(graph_name, "betweenness")
+        results, _ = self.rank_centrality("betweenness", k)
         print("Betweenness centrality scores:")
-        for result in results:
-            print(result["paperID"], result["score"])
+        for result in results.itertuples():
+            print(result.PaperID, result.Score)
 
     # Updated run_closeness method
-    def run_closeness(self, graph_name):
-        query = f"""
-        CALL gds.closeness.stream('{graph_name}')
-        YIELD nodeId, score
-        RETURN gds.util.asNode(nodeId).paperID AS paperID, score AS centrality
-        ORDER BY centrality DESC
-        LIMIT 10
-        """
-        results = self.conn.query(query)
+    def run_closeness(self, graph_name, k=10):
+        self.write_centrality(graph_name, "closeness")
+        results, _ = self.rank_centrality("closeness", k)
         print("Closeness centrality scores:")
-        for result in results:
-            print(result["paperID"], result["centrality"])
+        for result in results.itertuples():
+            print(result.PaperID, result.Score)
 
     def run_community_detection(self, graph_name):
 
@@ -2,12 +2,14 @@ from neo4j import GraphDatabase
 
 
 class Neo4jConnection:
-    def __init__(self, uri, user, password, db=None):
+    def __init__(self, uri, user, password, db=None, strict=False):
         self.__uri = uri
         self.__user = user
         self.__password = password
         self.__driver = None
         self.__db = db
+        # In strict mode failed queries are re-raised instead of returning None
+        self.__strict = strict
         try:
             self.__driver = GraphDatabase.driver(self.__uri, auth=(self.__user, self.__password))
         except Exception as e:
@@ -25,7 +27,24 @@ class Neo4jConnection:
             response = list(session.run(query, parameters))
         except Exception as e:
             print("Query failed:", e)
+            if self.__strict:
+                raise
         finally:
             if session is not None:
                 session.close()
         return response
+
+    def stream(self, query, parameters=None):
+        # Yields records as the server produces them instead of collecting them
+        session = None
+        try:
+            session = self.__driver.session(database=self.__db) if self.__db is not None else self.__driver.session()
+            for record in session.run(query, parameters):
+                yield record
+        except Exception as e:
+            print("Query failed:", e)
+            if self.__strict:
+                raise
+        finally:
+            if session is not None:
+                session.close()
@@ -0,0 +1,87 @@
+import json
+import os
+import time
+
+from tqdm import tqdm
+
+
+class StepTracker:
+    """Reports the progress of a single load/evolve step back to the journal."""
+
+    def __init__(self, journal, name):
+        self.journal = journal
+        self.name = name
+        self.entry = journal.steps[name]
+        self.bar = None
+
+    @property
+    def rows(self):
+        # CSV rows (header excluded) known to be committed, i.e. where a resumed step picks up again
+        return self.entry["rows"]
+
+    @property
+    def total(self):
+        return self.entry["total"]
+
+    def begin(self, total):
+        self.entry["total"] = total
+        self.journal.save()
+        self.bar = tqdm(total=total, initial=self.rows, desc=self.name, unit="rows")
+
+    def advance(self, rows):
+        if rows <= self.rows:
+            return
+        if self.bar is not None:
+            self.bar.update(rows - self.rows)
+        self.entry["rows"] = rows
+        self.journal.save()
+
+    def close(self):
+        if self.bar is not None:
+            self.bar.close()
+            self.bar = None
+
+
+class RunJournal:
+    """Persists the status, committed CSV rows and duration of every step to a JSON file."""
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.steps = {}
+        if resume and os.path.exists(path):
+            with open(path) as f:
+                self.steps = json.load(f)
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.steps, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def is_done(self, name):
+        return self.steps.get(name, {}).get("status") == "done"
+
+    def start(self, name):
+        entry = self.steps.setdefault(
+            name, {"rows": 0, "total": None, "duration": 0.0}
+        )
+        entry["status"] = "running"
+        entry["error"] = None
+        entry["started"] = time.time()
+        self.save()
+        return StepTracker(self, name)
+
+    def finish(self, tracker):
+        self._stop(tracker, "done")
+
+    def fail(self, tracker, error):
+        tracker.entry["error"] = str(error)
+        self._stop(tracker, "failed")
+
+    def _stop(self, tracker, status):
+        tracker.close()
+        entry = tracker.entry
+        entry["status"] = status
+        entry["duration"] += time.time() - entry.pop("started")
+        self.save()
@@ -0,0 +1,38 @@
+import re
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+# Words ending in "s" that are not plurals, or whose singular the rules below would mangle
+_UNCHANGED = {
+    "alias", "atlas", "bias", "canvas", "chaos", "ethos", "gas", "lens",
+    "mathematics", "news", "physics", "series", "species",
+}
+# Plurals of words ending in "ie" rather than "y"
+_IE_PLURALS = {"calories", "cookies", "movies", "zombies"}
+# Plurals of words ending in "che" rather than "ch"
+_CHE_PLURALS = {"avalanches", "caches", "headaches", "niches"}
+# Singulars after which the plural adds "es" rather than "s"
+_ES_ENDINGS = ("ss", "x", "zz", "ch", "sh")
+
+
+def _stem(token):
+    # Light plural stemming, enough to merge "networks"/"network" and "studies"/"study"
+    if len(token) <= 3 or token in _UNCHANGED:
+        return token
+    if token.endswith("ies"):
+        if len(token) <= 4 or token in _IE_PLURALS:
+            return token[:-1]
+        return token[:-3] + "y"
+    if token.endswith("es") and token not in _CHE_PLURALS:
+        singular = token[:-2]
+        if singular in _UNCHANGED or singular.endswith(_ES_ENDINGS):
+            return singular
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def normalize_keyword(keyword):
+    """Returns the lookup key of a keyword: lowercased, punctuation-free and stemmed."""
+    tokens = _NON_WORD.sub(" ", str(keyword).lower()).split()
+    return " ".join(_stem(token) for token in tokens)
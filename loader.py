@@ -2,6 +2,7 @@ import argparse
 import configparser
 import os
 from connection import Neo4jConnection
+from journal import RunJournal
 import PartAKhanPaudel as dlf
 
 
@@ -11,9 +12,30 @@ def load_config(config_file):
     return config
 
 
+def run_step(journal, step, func, *args):
+    if journal.is_done(step):
+        print(f"Skipping {step}, already done.")
+        return
+    tracker = journal.start(step)
+    try:
+        func(*args, tracker)
+    except Exception as e:
+        journal.fail(tracker, e)
+        raise
+    journal.finish(tracker)
+
+
+def run_tasks(conn, config, journal, phase, tasks):
+    for key, func in tasks.items():
+        run_step(journal, f"{phase}:{key}", func, conn, config.get('csv_paths', key))
+
+
 def main():
     parser = argparse.ArgumentParser(description='Load data into Neo4j.')
     parser.add_argument('--config', type=str, default='config.ini', help='Path to configuration file.')
+    parser.add_argument('--journal', type=str, default='load_journal.json', help='Path to the run journal.')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip steps the journal marks as done and restart the failed one from its last committed batch of rows.')
     # Add other arguments as needed
     args = parser.parse_args()
 
@@ -24,8 +46,16 @@ def main():
     password = os.getenv("NEO4J_PASSWORD", config.get('neo4j', 'password'))
     db = os.getenv("NEO4J_DATABASE", config.get('neo4j', 'database'))
 
-    conn = Neo4jConnection(uri, user, password, db)
+    # Strict so that a failed query fails its step instead of looking like a success
+    conn = Neo4jConnection(uri, user, password, db, strict=True)
+    journal = RunJournal(args.journal, resume=args.resume)
 
+    # Schema steps run before loading so that every MERGE is backed by an index
+    schema_tasks = {
+        'constraints': dlf.create_constraints,
+        'keyword_indexes': dlf.create_keyword_indexes,
+        'paper_fulltext': dlf.create_paper_fulltext_index,
+    }
     # Define a mapping of config keys to loading functions
     load_tasks = {
         'authors': dlf.load_authors,
@@ -54,16 +84,16 @@ def main():
     }
 
     try:
+        print("Creating schema...")
+        for key, func in schema_tasks.items():
+            run_step(journal, f"schema:{key}", func, conn)
         print("Loading data into Neo4j...")
-        for key, func in load_tasks.items():
-                csv_path = config.get('csv_paths', key)
-                func(conn, csv_path)
+        run_tasks(conn, config, journal, "load", load_tasks)
         print("Evolving graph schema...")
-        for key, func in evolve_tasks.items():
-            csv_path = config.get('csv_paths', key)
-            func(conn, csv_path)
+        run_tasks(conn, config, journal, "evolve", evolve_tasks)
     except Exception as e:
         print(f"An error occurred: {e}")
+        print(f"Progress is recorded in {args.journal}; rerun with --resume to continue.")
     finally:
         conn.close()
         print("Connection closed.")
@@ -0,0 +1,171 @@
+import pandas as pd
+
+CENTRALITY_ALGORITHMS = ("pageRank", "betweenness", "closeness")
+
+# Optional venue name and year range filters on a `paper` variable
+VENUE_FILTER = """($venue IS NULL OR EXISTS {
+        MATCH (paper)-[:PUBLISHED_IN]->()-[:PRESENTED_IN]->(venue)
+        WHERE venue.name = $venue
+    })"""
+YEAR_FILTER = """($yearFrom IS NULL AND $yearTo IS NULL OR EXISTS {
+        MATCH (paper)-[:IN_YEAR]->(year)
+        WHERE ($yearFrom IS NULL OR year.year >= $yearFrom)
+        AND ($yearTo IS NULL OR year.year <= $yearTo)
+    })"""
+PAPER_FILTERS = f"{VENUE_FILTER}\n    AND {YEAR_FILTER}"
+
+# Authors with at least one paper matching the paper filters
+AUTHOR_FILTERS = f"""($venue IS NULL AND $yearFrom IS NULL AND $yearTo IS NULL OR EXISTS {{
+        MATCH (a)-[:WRITES]->(paper:Paper)
+        WHERE {PAPER_FILTERS}
+    }})"""
+
+BATCH_SIZE = 10000
+
+
+def run_query(conn, query, parameters=None):
+    query_result = conn.query(query, parameters)
+    return pd.DataFrame([dict(record) for record in query_result])
+
+
+def write_rank(conn, label, score_property, id_property, batch_size=BATCH_SIZE):
+    # Numbers nodes by (score DESC, id ASC) into an indexed <score>Rank property,
+    # so every page of a ranking is an index seek past the previous page's rank.
+    rank_property = f"{score_property}Rank"
+    conn.query(f"""CREATE INDEX {label.lower()}_{rank_property.lower()} IF NOT EXISTS
+    FOR (n:{label}) ON (n.{rank_property})""")
+    conn.query(f"""MATCH (n:{label})
+    WHERE n.{score_property} IS NOT NULL
+    WITH n
+    ORDER BY n.{score_property} DESC, n.{id_property}
+    WITH collect(n) AS nodes
+    UNWIND range(0, size(nodes) - 1) AS rank
+    WITH nodes[rank] AS n, rank
+    CALL {{
+        WITH n, rank
+        SET n.{rank_property} = rank
+    }} IN TRANSACTIONS OF $batchSize ROWS""", {"batchSize": batch_size})
+
+
+def write_citation_scores(conn, batch_size=BATCH_SIZE):
+    """Stores Paper.citationCount and Author.hIndex, and their ranks, for the rankings below."""
+    conn.query("""MATCH (p:Paper)
+    CALL {
+        WITH p
+        SET p.citationCount = COUNT { (p)<-[:CITES]-() }
+    } IN TRANSACTIONS OF $batchSize ROWS""", {"batchSize": batch_size})
+    conn.query("""MATCH (a:Author)
+    CALL {
+        WITH a
+        CALL {
+            WITH a
+            MATCH (a)-[:WRITES]->(p:Paper)
+            WITH p.citationCount AS citations
+            ORDER BY citations DESC
+            RETURN collect(citations) AS citationCounts
+        }
+        SET a.hIndex = size([i IN range(0, size(citationCounts) - 1) WHERE citationCounts[i] > i])
+    } IN TRANSACTIONS OF $batchSize ROWS""", {"batchSize": batch_size})
+    write_rank(conn, "Paper", "citationCount", "paperID", batch_size)
+    write_rank(conn, "Author", "hIndex", "authorID", batch_size)
+    print("Citation scores written successfully.")
+
+
+def write_centrality_scores(conn, graph_name, algorithm, batch_size=BATCH_SIZE):
+    """Runs a GDS centrality algorithm once and stores its score, named after it, on every Paper."""
+    if algorithm not in CENTRALITY_ALGORITHMS:
+        raise ValueError(f"Unknown centrality algorithm: {algorithm}")
+    query = f"""CALL gds.{algorithm}.write($graphName, {{writeProperty: $property}})
+    YIELD nodePropertiesWritten
+    RETURN nodePropertiesWritten"""
+    conn.query(query, {"graphName": graph_name, "property": algorithm})
+    write_rank(conn, "Paper", algorithm, "paperID", batch_size)
+    print(f"{algorithm} scores written successfully.")
+
+
+def _parameters(k, offset, cursor, venue, year_from, year_to):
+    return {
+        "k": k,
+        "offset": offset,
+        "after": -1 if cursor is None else cursor["rank"],
+        "venue": venue,
+        "yearFrom": year_from,
+        "yearTo": year_to,
+    }
+
+
+def _page(conn, query, parameters):
+    # Returns one page and the cursor of its last row, or None on the last page
+    page = run_query(conn, query, parameters)
+    if len(page) < parameters["k"]:
+        return page, None
+    return page, {"rank": page.iloc[-1]["Rank"].item()}
+
+
+def top_cited_papers_per_conference(conn, k=3, venue=None, year_from=None, year_to=None):
+    """Top k most cited papers of every conference, selected per conference on the server."""
+    query = f"""MATCH (c:Conference)
+    WHERE $venue IS NULL OR c.name = $venue
+    CALL {{
+        WITH c
+        MATCH (c)<-[:PRESENTED_IN]-(:Proceedings {{type: "conference"}})<-[:PUBLISHED_IN]-(paper:Paper)
+        WHERE {YEAR_FILTER}
+        WITH DISTINCT paper
+        WITH paper, COUNT {{ (paper)<-[:CITES]-() }} AS citations
+        ORDER BY citations DESC, paper.paperID
+        LIMIT $k
+        RETURN collect(paper.title) AS papers, collect(citations) AS counts
+    }}
+    WITH c, papers, counts
+    WHERE size(papers) > 0
+    RETURN c.name AS ConferenceName, papers AS TopPapers, counts AS Citations
+    ORDER BY ConferenceName"""
+    return run_query(conn, query, _parameters(k, 0, None, venue, year_from, year_to))
+
+
+def rank_papers_by_citations(conn, k=10, offset=0, cursor=None, venue=None, year_from=None, year_to=None):
+    """One page of papers ordered by the citation count stored by write_citation_scores."""
+    query = f"""MATCH (paper:Paper)
+    WHERE paper.citationCountRank > $after AND {PAPER_FILTERS}
+    RETURN paper.paperID AS PaperID, paper.title AS Title,
+    paper.citationCount AS Citations, paper.citationCountRank AS Rank
+    ORDER BY Rank
+    SKIP $offset LIMIT $k"""
+    return _page(conn, query, _parameters(k, offset, cursor, venue, year_from, year_to))
+
+
+def rank_authors_by_h_index(conn, k=10, offset=0, cursor=None, venue=None, year_from=None, year_to=None):
+    """One page of authors ordered by the h-index stored by write_citation_scores.
+
+    The filters select authors with at least one matching paper; the h-index
+    itself always counts all of an author's papers.
+    """
+    query = f"""MATCH (a:Author)
+    WHERE a.hIndexRank > $after AND a.hIndex > 0 AND {AUTHOR_FILTERS}
+    RETURN a.authorID AS AuthorID, a.name AS Author, a.hIndex AS HIndex, a.hIndexRank AS Rank
+    ORDER BY Rank
+    SKIP $offset LIMIT $k"""
+    return _page(conn, query, _parameters(k, offset, cursor, venue, year_from, year_to))
+
+
+def rank_papers_by_centrality(conn, algorithm, k=10, offset=0, cursor=None, venue=None, year_from=None, year_to=None):
+    """One page of papers ordered by a centrality score stored by write_centrality_scores."""
+    if algorithm not in CENTRALITY_ALGORITHMS:
+        raise ValueError(f"Unknown centrality algorithm: {algorithm}")
+    query = f"""MATCH (paper:Paper)
+    WHERE paper.{algorithm}Rank > $after AND {PAPER_FILTERS}
+    RETURN paper.paperID AS PaperID, paper.{algorithm} AS Score, paper.{algorithm}Rank AS Rank
+    ORDER BY Rank
+    SKIP $offset LIMIT $k"""
+    return _page(conn, query, _parameters(k, offset, cursor, venue, year_from, year_to))
+
+
+def iter_pages(rank, conn, page_size=10000, **kwargs):
+    """Yields successive pages of a ranking by following its rank cursor."""
+    cursor = None
+    while True:
+        page, cursor = rank(conn, k=page_size, cursor=cursor, **kwargs)
+        if len(page) > 0:
+            yield page
+        if cursor is None:
+            break
@@ -0,0 +1,478 @@
+import argparse
+import configparser
+import datetime
+import json
+import os
+import shutil
+
+import numpy as np
+from neo4j.time import Date
+
+from connection import Neo4jConnection
+
+BATCH_SIZE = 50000
+# Temporary label and property used to match relationship endpoints while restoring
+SNAPSHOT_LABEL = "_SnapshotNode"
+SNAPSHOT_INDEX = "_snapshotIndex"
+
+
+def load_config(config_file="config.ini"):
+    # Try to read from environment variables first
+    uri = os.getenv("NEO4J_URI")
+    user = os.getenv("NEO4J_USER")
+    password = os.getenv("NEO4J_PASSWORD")
+    database = os.getenv("NEO4J_DATABASE")
+
+    if uri and user and password and database:
+        return {"uri": uri, "user": user, "password": password, "database": database}
+
+    # Fallback to config file if environment variables are not set
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    return config["neo4j"]
+
+
+# Neo4j schema property types mapped to column kinds. Properties mixing Long and
+# Double come back as Double; any other type (points, datetimes, durations, mixed
+# types) is kept as JSON text and comes back as a string.
+PROPERTY_KINDS = {
+    "String": "str",
+    "Long": "int",
+    "Integer": "int",
+    "Double": "float",
+    "Float": "float",
+    "Boolean": "bool",
+    "Date": "date",
+}
+FIXED_DTYPES = {
+    "bool": np.bool_,
+    "int": np.int64,
+    "float": np.float64,
+    "date": "datetime64[D]",
+}
+
+
+def _column_kind(property_types):
+    kinds = {PROPERTY_KINDS.get(property_type, "json") for property_type in property_types}
+    if kinds == {"int", "float"}:
+        return "float"
+    if len(kinds) == 1:
+        return kinds.pop()
+    return "json"
+
+
+class ColumnWriter:
+    """Writes one property column of `count` rows, a batch at a time.
+
+    Fixed-width kinds go to a single .npy array. Strings and JSON are stored as a
+    UTF-8 byte buffer (<key>.npy) plus an int64 offsets array (<key>.offsets.npy)
+    of count + 1 entries, so neither has to be padded to the longest value.
+    """
+
+    def __init__(self, directory, key, kind, count):
+        self.path = os.path.join(directory, f"{key}.npy")
+        self.null_path = os.path.join(directory, f"{key}.null.npy")
+        self.kind = kind
+        self.nulls = np.lib.format.open_memmap(self.null_path, mode="w+", dtype=np.bool_, shape=(count,))
+        if kind in FIXED_DTYPES:
+            self.values = np.lib.format.open_memmap(self.path, mode="w+", dtype=FIXED_DTYPES[kind], shape=(count,))
+        else:
+            self.offsets_path = os.path.join(directory, f"{key}.offsets.npy")
+            self.offsets = np.lib.format.open_memmap(self.offsets_path, mode="w+", dtype=np.int64, shape=(count + 1,))
+            self.buffer = open(self.path + ".tmp", "wb")
+            self.size = 0
+
+    def write(self, start, values):
+        stop = start + len(values)
+        self.nulls[start:stop] = [v is None for v in values]
+        if self.kind == "date":
+            self.values[start:stop] = [
+                "NaT" if v is None else v.iso_format() if isinstance(v, Date) else v.isoformat() for v in values
+            ]
+        elif self.kind in FIXED_DTYPES:
+            default = np.nan if self.kind == "float" else 0
+            self.values[start:stop] = [default if v is None else v for v in values]
+        else:
+            for i, value in enumerate(values, start):
+                if value is None:
+                    data = b""
+                elif self.kind == "str":
+                    data = value.encode("utf-8")
+                else:
+                    data = json.dumps(value, default=str).encode("utf-8")
+                self.buffer.write(data)
+                self.size += len(data)
+                self.offsets[i + 1] = self.size
+
+    def close(self):
+        has_nulls = bool(self.nulls.any())
+        del self.nulls
+        if not has_nulls:
+            os.remove(self.null_path)
+        if self.kind in FIXED_DTYPES:
+            self.values.flush()
+            return
+        self.offsets.flush()
+        self.buffer.close()
+        # Prepend an .npy header to the raw bytes so the buffer can be memory-mapped
+        with open(self.path, "wb") as f, open(self.path + ".tmp", "rb") as buffer:
+            np.lib.format.write_array_header_1_0(
+                f, {"descr": "|u1", "fortran_order": False, "shape": (self.size,)}
+            )
+            shutil.copyfileobj(buffer, f)
+        os.remove(self.path + ".tmp")
+
+
+def _write_columns(directory, columns, count, records):
+    """Streams `records` (property maps) in batches into one ColumnWriter per column."""
+    os.makedirs(directory, exist_ok=True)
+    writers = {key: ColumnWriter(directory, key, kind, count) for key, kind in columns.items()}
+    start = 0
+    for batch in _batches(records):
+        for key, writer in writers.items():
+            writer.write(start, [props.get(key) for props in batch])
+        start += len(batch)
+    for writer in writers.values():
+        writer.close()
+    if start != count:
+        raise RuntimeError(f"Expected {count} rows in {directory} but read {start}; is the database being written to?")
+
+
+def _batches(records, batch_size=BATCH_SIZE):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _decode_value(value, kind):
+    if kind == "bool":
+        return bool(value)
+    if kind == "int":
+        return int(value)
+    if kind == "float":
+        return float(value)
+    if kind == "date":
+        return value.astype(object)
+    if kind == "str":
+        return value
+    return json.loads(value)
+
+
+def _read_column(directory, key, kind, start, stop):
+    if kind in FIXED_DTYPES:
+        return np.load(os.path.join(directory, f"{key}.npy"), mmap_mode="r")[start:stop]
+    data, offsets = load_string_column(directory, key)
+    offsets = offsets[start:stop + 1]
+    chunk = bytes(data[offsets[0]:offsets[-1]])
+    base = offsets[0]
+    return [
+        chunk[offsets[i] - base:offsets[i + 1] - base].decode("utf-8")
+        for i in range(stop - start)
+    ]
+
+
+def _read_rows(directory, columns, start, stop):
+    rows = [{} for _ in range(stop - start)]
+    for key, kind in columns.items():
+        values = _read_column(directory, key, kind, start, stop)
+        null_path = os.path.join(directory, f"{key}.null.npy")
+        nulls = np.load(null_path, mmap_mode="r")[start:stop] if os.path.exists(null_path) else None
+        for i, value in enumerate(values):
+            if nulls is None or not nulls[i]:
+                rows[i][key] = _decode_value(value, kind)
+    return rows
+
+
+def _group_name(labels):
+    return "__".join(labels) if labels else "_unlabeled"
+
+
+def _schema_columns(conn):
+    # Column kinds per node label combination and per relationship type
+    node_columns = {}
+    for record in conn.query("""CALL db.schema.nodeTypeProperties()
+    YIELD nodeLabels, propertyName, propertyTypes
+    WHERE propertyName IS NOT NULL
+    RETURN nodeLabels, propertyName, propertyTypes"""):
+        columns = node_columns.setdefault(tuple(sorted(record["nodeLabels"])), {})
+        columns[record["propertyName"]] = _column_kind(record["propertyTypes"])
+    rel_columns = {}
+    for record in conn.query("""CALL db.schema.relTypeProperties()
+    YIELD relType, propertyName, propertyTypes
+    WHERE propertyName IS NOT NULL
+    RETURN relType, propertyName, propertyTypes"""):
+        columns = rel_columns.setdefault(record["relType"][2:-1], {})
+        columns[record["propertyName"]] = _column_kind(record["propertyTypes"])
+    return node_columns, rel_columns
+
+
+def _unlisted_columns(conn, pattern, parameters):
+    # Groups db.schema does not report are scanned for their keys and kept as JSON
+    query = f"""MATCH {pattern}
+    WHERE size(labels(n)) = $size AND all(label IN labels(n) WHERE label IN $labels)
+    UNWIND keys(n) AS key
+    RETURN DISTINCT key"""
+    return {record["key"]: "json" for record in conn.query(query, parameters)}
+
+
+def _export_schema(conn):
+    constraints = conn.query("""SHOW CONSTRAINTS
+    YIELD name, createStatement
+    RETURN name, createStatement""")
+    # Indexes backing constraints are recreated with them; token lookup indexes always exist
+    indexes = conn.query("""SHOW INDEXES
+    YIELD name, type, owningConstraint, createStatement
+    WHERE owningConstraint IS NULL AND type <> "LOOKUP"
+    RETURN name, createStatement""")
+    return {
+        "constraints": [dict(record) for record in constraints],
+        "indexes": [dict(record) for record in indexes],
+    }
+
+
+def _import_schema(conn, schema):
+    existing = {record["name"] for record in conn.query("SHOW CONSTRAINTS YIELD name RETURN name")}
+    existing |= {record["name"] for record in conn.query("SHOW INDEXES YIELD name RETURN name")}
+    for entry in schema["constraints"] + schema["indexes"]:
+        if entry["name"] not in existing:
+            conn.query(entry["createStatement"])
+    conn.query("CALL db.awaitIndexes()")
+    print(f"Restored {len(schema['constraints'])} constraints and {len(schema['indexes'])} indexes.")
+
+
+def export_snapshot(conn, snapshot_dir):
+    """Exports every node label combination and relationship type to .npy columns.
+
+    Nodes get a dense index across the whole snapshot; relationships are stored as
+    src/dst arrays of those indices so analytics code can memory-map them directly.
+    Records are streamed and written in batches, so the database should not be
+    written to while the export runs.
+    """
+    manifest = {"nodes": [], "relationships": [], "schema": _export_schema(conn)}
+    node_columns, rel_columns = _schema_columns(conn)
+    # Internal node ids in snapshot order, used to translate relationship endpoints
+    group_ids = []
+
+    groups = conn.query("""MATCH (n)
+    RETURN DISTINCT labels(n) AS labels""")
+    offset = 0
+    for labels in sorted({tuple(sorted(group["labels"])) for group in groups}):
+        columns = node_columns.get(labels)
+        labels = list(labels)
+        name = _group_name(labels)
+        # Unlabeled nodes (e.g. the Community targets merged in PartC) need a full scan
+        pattern = f"(n:`{labels[0]}`)" if labels else "(n)"
+        parameters = {"size": len(labels), "labels": labels}
+        if columns is None:
+            columns = _unlisted_columns(conn, pattern, parameters)
+        count = conn.query(f"""MATCH {pattern}
+        WHERE size(labels(n)) = $size AND all(label IN labels(n) WHERE label IN $labels)
+        RETURN count(n) AS count""", parameters)[0]["count"]
+
+        ids = np.empty(count, dtype=np.int64)
+        position = 0
+
+        def props(records):
+            nonlocal position
+            for record in records:
+                ids[position] = record["id"]
+                position += 1
+                yield record["props"]
+
+        records = conn.stream(f"""MATCH {pattern}
+        WHERE size(labels(n)) = $size AND all(label IN labels(n) WHERE label IN $labels)
+        RETURN id(n) AS id, properties(n) AS props""", parameters)
+        _write_columns(os.path.join(snapshot_dir, "nodes", name), columns, count, props(records))
+        group_ids.append(ids)
+        manifest["nodes"].append(
+            {"name": name, "labels": labels, "offset": offset, "count": count, "columns": columns}
+        )
+        offset += count
+        print(f"Exported {count} {name} nodes.")
+
+    all_ids = np.concatenate(group_ids) if group_ids else np.empty(0, dtype=np.int64)
+    order = np.argsort(all_ids)
+    sorted_ids = all_ids[order]
+    del group_ids, all_ids
+
+    types = conn.query("""MATCH ()-[r]->()
+    RETURN DISTINCT type(r) AS type""")
+    for rel_type in sorted(record["type"] for record in types):
+        directory = os.path.join(snapshot_dir, "relationships", rel_type)
+        columns = rel_columns.get(rel_type, {})
+        count = conn.query(f"""MATCH ()-[r:`{rel_type}`]->()
+        RETURN count(r) AS count""")[0]["count"]
+        os.makedirs(directory, exist_ok=True)
+        src = np.lib.format.open_memmap(os.path.join(directory, "src.npy"), mode="w+", dtype=np.int64, shape=(count,))
+        dst = np.lib.format.open_memmap(os.path.join(directory, "dst.npy"), mode="w+", dtype=np.int64, shape=(count,))
+        position = 0
+
+        def endpoints(records):
+            nonlocal position
+            for batch in _batches(records):
+                stop = position + len(batch)
+                src[position:stop] = order[np.searchsorted(sorted_ids, [r["src"] for r in batch])]
+                dst[position:stop] = order[np.searchsorted(sorted_ids, [r["dst"] for r in batch])]
+                position = stop
+                for record in batch:
+                    yield record["props"]
+
+        records = conn.stream(f"""MATCH (a)-[r:`{rel_type}`]->(b)
+        RETURN id(a) AS src, id(b) AS dst, properties(r) AS props""")
+        _write_columns(directory, columns, count, endpoints(records))
+        src.flush()
+        dst.flush()
+        del src, dst
+        manifest["relationships"].append({"type": rel_type, "count": count, "columns": columns})
+        print(f"Exported {count} {rel_type} relationships.")
+
+    with open(os.path.join(snapshot_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Snapshot written to {snapshot_dir}.")
+
+
+def read_manifest(snapshot_dir):
+    with open(os.path.join(snapshot_dir, "manifest.json")) as f:
+        return json.load(f)
+
+
+def load_edges(snapshot_dir, rel_type):
+    """Memory-maps the (src, dst) node index arrays of a relationship type."""
+    directory = os.path.join(snapshot_dir, "relationships", rel_type)
+    return (
+        np.load(os.path.join(directory, "src.npy"), mmap_mode="r"),
+        np.load(os.path.join(directory, "dst.npy"), mmap_mode="r"),
+    )
+
+
+def load_string_column(directory, key):
+    """Memory-maps the UTF-8 bytes and offsets of a string column; row i is data[offsets[i]:offsets[i + 1]]."""
+    return (
+        np.load(os.path.join(directory, f"{key}.npy"), mmap_mode="r"),
+        np.load(os.path.join(directory, f"{key}.offsets.npy"), mmap_mode="r"),
+    )
+
+
+def load_node_column(snapshot_dir, name, key):
+    """Memory-maps one fixed-width property column of a node group, e.g. ("Paper", "publicationDate")."""
+    return np.load(os.path.join(snapshot_dir, "nodes", name, f"{key}.npy"), mmap_mode="r")
+
+
+# How to reset the database by hand when a failed import cannot be fully undone
+MANUAL_CLEANUP = (
+    "Empty the database with `MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS` "
+    "and run `DROP INDEX snapshot_index IF EXISTS` before importing again."
+)
+
+
+def _discard_partial_import(conn, batch_size):
+    # Deletes what a failed import restored so it can be rerun into an empty database
+    try:
+        conn.query(f"""MATCH (n:{SNAPSHOT_LABEL})
+        CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {batch_size} ROWS""")
+        conn.query("DROP INDEX snapshot_index IF EXISTS")
+        # Nodes whose temporary label was already removed are not found above
+        leftover = conn.query("MATCH (n) RETURN n LIMIT 1")
+    except Exception:
+        print(f"Could not remove the partially restored snapshot. {MANUAL_CLEANUP}")
+        raise
+    if leftover:
+        print(f"The partially restored snapshot was only partly removed. {MANUAL_CLEANUP}")
+    else:
+        print("Removed the partially restored snapshot.")
+
+
+def import_snapshot(conn, snapshot_dir, batch_size=BATCH_SIZE):
+    """Restores a snapshot into an empty database with batched UNWIND statements.
+
+    Raises RuntimeError if the database already holds nodes. If the restore fails
+    partway, the nodes it created are deleted again before the error is re-raised.
+    """
+    manifest = read_manifest(snapshot_dir)
+    if conn.query("MATCH (n) RETURN n LIMIT 1"):
+        raise RuntimeError("Snapshots can only be imported into an empty database.")
+
+    try:
+        _restore(conn, snapshot_dir, manifest, batch_size)
+    except Exception:
+        _discard_partial_import(conn, batch_size)
+        raise
+    # Constraints and indexes are created last so they are built once over the restored data
+    _import_schema(conn, manifest["schema"])
+    print(f"Snapshot restored from {snapshot_dir}.")
+
+
+def _restore(conn, snapshot_dir, manifest, batch_size):
+    # Every restored node temporarily carries SNAPSHOT_LABEL so relationship
+    # endpoints (including unlabeled nodes) are matched through a single index.
+    conn.query(f"""CREATE INDEX snapshot_index IF NOT EXISTS
+    FOR (n:{SNAPSHOT_LABEL}) ON (n.{SNAPSHOT_INDEX})""")
+    conn.query("CALL db.awaitIndexes()")
+
+    for group in manifest["nodes"]:
+        directory = os.path.join(snapshot_dir, "nodes", group["name"])
+        labels = "".join(f":`{label}`" for label in [SNAPSHOT_LABEL] + group["labels"])
+        query = f"""UNWIND $rows AS row
+        CREATE (n{labels})
+        SET n = row.props, n.{SNAPSHOT_INDEX} = row.index"""
+        for start in range(0, group["count"], batch_size):
+            stop = min(start + batch_size, group["count"])
+            props = _read_rows(directory, group["columns"], start, stop)
+            rows = [{"index": group["offset"] + start + i, "props": p} for i, p in enumerate(props)]
+            conn.query(query, {"rows": rows})
+        print(f"Imported {group['count']} {group['name']} nodes.")
+
+    for rel in manifest["relationships"]:
+        directory = os.path.join(snapshot_dir, "relationships", rel["type"])
+        src, dst = load_edges(snapshot_dir, rel["type"])
+        query = f"""UNWIND $rows AS row
+        MATCH (a:{SNAPSHOT_LABEL} {{{SNAPSHOT_INDEX}: row.src}})
+        MATCH (b:{SNAPSHOT_LABEL} {{{SNAPSHOT_INDEX}: row.dst}})
+        CREATE (a)-[r:`{rel['type']}`]->(b)
+        SET r = row.props"""
+        for start in range(0, rel["count"], batch_size):
+            stop = min(start + batch_size, rel["count"])
+            props = _read_rows(directory, rel["columns"], start, stop)
+            rows = [
+                {"src": int(s), "dst": int(d), "props": p}
+                for s, d, p in zip(src[start:stop], dst[start:stop], props)
+            ]
+            conn.query(query, {"rows": rows})
+        print(f"Imported {rel['count']} {rel['type']} relationships.")
+
+    conn.query(f"""MATCH (n:{SNAPSHOT_LABEL})
+    CALL {{ WITH n REMOVE n:{SNAPSHOT_LABEL}, n.{SNAPSHOT_INDEX} }} IN TRANSACTIONS OF {batch_size} ROWS""")
+    conn.query("DROP INDEX snapshot_index IF EXISTS")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or restore a graph snapshot.")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("snapshot_dir", type=str, help="Directory holding the snapshot.")
+    parser.add_argument("--config", type=str, default="config.ini", help="Path to configuration file.")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    conn = Neo4jConnection(
+        config["uri"], config["user"], config["password"], config["database"], strict=True
+    )
+
+    try:
+        if args.action == "export":
+            export_snapshot(conn, args.snapshot_dir)
+        else:
+            import_snapshot(conn, args.snapshot_dir)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+    finally:
+        conn.close()
+        print("Connection to Neo4j closed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import pytest
+
+from keywords import normalize_keyword
+
+
+@pytest.mark.parametrize(
+    "keyword, key",
+    [
+        ("Graph Neural Networks", "graph neural network"),
+        ("graph neural network", "graph neural network"),
+        ("Knowledge-Graphs", "knowledge graph"),
+        ("  bipartite   graphs ", "bipartite graph"),
+        ("case studies", "case study"),
+        ("classes", "class"),
+        ("analysis", "analysis"),
+        ("corpus", "corpus"),
+        ("laws", "law"),
+        ("cows", "cow"),
+        ("biases", "bias"),
+        ("gases", "gas"),
+        ("boxes", "box"),
+        ("indexes", "index"),
+        ("searches", "search"),
+        ("hashes", "hash"),
+        ("buzzes", "buzz"),
+        ("databases", "database"),
+        ("caches", "cache"),
+    ],
+)
+def test_normalize_keyword_folds_case_punctuation_and_plurals(keyword, key):
+    assert normalize_keyword(keyword) == key
+
+
+@pytest.mark.parametrize(
+    "keyword, key",
+    [
+        ("time series", "time series"),
+        ("species", "species"),
+        ("news", "news"),
+        ("fake news", "fake news"),
+        ("bias", "bias"),
+        ("movies", "movie"),
+        ("ties", "tie"),
+        ("gas", "gas"),
+    ],
+)
+def test_normalize_keyword_keeps_words_the_plural_rules_would_mangle(keyword, key):
+    assert normalize_keyword(keyword) == key
+
+
+def test_news_and_new_get_different_keys():
+    assert normalize_keyword("news") != normalize_keyword("new")
+
+
+@pytest.mark.parametrize(
+    "singular, plural",
+    [("law", "laws"), ("bias", "biases"), ("box", "boxes"), ("gas", "gases"), ("class", "classes")],
+)
+def test_singular_and_plural_get_the_same_key(singular, plural):
+    assert normalize_keyword(singular) == normalize_keyword(plural)
+
+
+def test_keyword_without_words_has_an_empty_key():
+    assert normalize_keyword("!!!") == ""
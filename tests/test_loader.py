@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+import PartAKhanPaudel as dlf
+from journal import RunJournal
+from loader import run_step
+
+ROWS = 25000
+
+
+class FakeConnection:
+    """Answers the row count and streams the committed row of every full batch."""
+
+    def __init__(self, fail_after=None):
+        # Number of committed batches to report before the stream raises
+        self.fail_after = fail_after
+        self.queries = []
+        self.skips = []
+
+    def query(self, query, parameters=None):
+        self.queries.append(query)
+        if "AS rows" in query:
+            return [{"rows": ROWS}]
+        return []
+
+    def stream(self, query, parameters=None):
+        self.skips.append(parameters["skip"])
+        batch_size = parameters["batchSize"]
+        committed = range(parameters["skip"] + batch_size, ROWS + 1, batch_size)
+        for batch, number in enumerate(committed):
+            if batch == self.fail_after:
+                raise RuntimeError("connection lost")
+            yield {"committed": number}
+
+
+def load(journal, conn):
+    run_step(journal, "schema:constraints", dlf.create_constraints, conn)
+    run_step(journal, "load:authors", dlf.load_authors, conn, "file:///authors.csv")
+
+
+def test_step_records_rows_and_total(tmp_path):
+    path = str(tmp_path / "journal.json")
+    conn = FakeConnection()
+    load(RunJournal(path), conn)
+
+    steps = json.load(open(path))
+    assert steps["load:authors"]["status"] == "done"
+    assert steps["load:authors"]["rows"] == ROWS
+    assert steps["load:authors"]["total"] == ROWS
+    assert conn.skips == [0]
+
+
+def test_resume_skips_done_steps_and_restarts_from_last_committed_batch(tmp_path):
+    path = str(tmp_path / "journal.json")
+    conn = FakeConnection(fail_after=1)
+    with pytest.raises(RuntimeError):
+        load(RunJournal(path), conn)
+
+    steps = json.load(open(path))
+    assert steps["schema:constraints"]["status"] == "done"
+    assert steps["load:authors"]["status"] == "failed"
+    assert steps["load:authors"]["error"] == "connection lost"
+    assert steps["load:authors"]["rows"] == dlf.BATCH_SIZE
+
+    resumed = FakeConnection()
+    load(RunJournal(path, resume=True), resumed)
+
+    steps = json.load(open(path))
+    assert steps["load:authors"]["status"] == "done"
+    assert steps["load:authors"]["rows"] == ROWS
+    assert resumed.skips == [dlf.BATCH_SIZE]
+    # Neither the finished schema step nor the row count is run again
+    assert not any("CONSTRAINT" in query for query in resumed.queries)
+    assert not any("AS rows" in query for query in resumed.queries)
+
+
+def test_without_resume_the_journal_starts_over(tmp_path):
+    path = str(tmp_path / "journal.json")
+    with pytest.raises(RuntimeError):
+        load(RunJournal(path), FakeConnection(fail_after=1))
+
+    conn = FakeConnection()
+    load(RunJournal(path), conn)
+    assert conn.skips == [0]
+    assert any("CONSTRAINT" in query for query in conn.queries)
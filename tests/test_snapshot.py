@@ -0,0 +1,109 @@
+import datetime
+import os
+
+import numpy as np
+import pytest
+
+from snapshot import _column_kind, _read_rows, _write_columns, load_string_column
+
+COLUMNS = {
+    "title": "str",
+    "citations": "int",
+    "score": "float",
+    "open": "bool",
+    "published": "date",
+    "extra": "json",
+}
+RECORDS = [
+    {
+        "title": "Graph Neural Networks",
+        "citations": 12,
+        "score": 0.5,
+        "open": True,
+        "published": datetime.date(2020, 1, 31),
+        "extra": {"pages": [1, 10]},
+    },
+    {"title": "Ünïcödé – ✓ " + "x" * 5000, "citations": 3, "score": 1.25, "open": False},
+    {},
+    {
+        "title": "",
+        "citations": 0,
+        "score": 2,
+        "open": False,
+        "published": datetime.date(1999, 12, 1),
+        "extra": ["a", None],
+    },
+]
+
+
+@pytest.fixture
+def group(tmp_path):
+    directory = str(tmp_path / "Paper")
+    _write_columns(directory, COLUMNS, len(RECORDS), iter(RECORDS))
+    return directory
+
+
+def test_columns_round_trip_with_nulls(group):
+    rows = _read_rows(group, COLUMNS, 0, len(RECORDS))
+    assert rows[0] == RECORDS[0]
+    assert rows[1] == RECORDS[1]
+    assert rows[2] == {}
+    assert rows[3] == RECORDS[3]
+    assert isinstance(rows[3]["score"], float)
+    assert isinstance(rows[0]["citations"], int)
+
+
+def test_slice_starting_past_the_first_row(group):
+    assert _read_rows(group, COLUMNS, 1, 3) == [RECORDS[1], {}]
+    assert _read_rows(group, COLUMNS, 3, 4) == [RECORDS[3]]
+
+
+def test_strings_are_stored_as_utf8_buffer_and_offsets(group):
+    data, offsets = load_string_column(group, "title")
+    assert data.dtype == np.uint8
+    assert offsets.tolist()[0] == 0
+    assert len(offsets) == len(RECORDS) + 1
+    assert bytes(data[offsets[1]:offsets[2]]).decode("utf-8") == RECORDS[1]["title"]
+    assert data.nbytes == sum(len(r.get("title", "").encode("utf-8")) for r in RECORDS)
+
+
+def test_null_masks_are_only_kept_for_columns_with_nulls(group):
+    assert os.path.exists(os.path.join(group, "published.null.npy"))
+    assert os.path.exists(os.path.join(group, "extra.null.npy"))
+    nulls = np.load(os.path.join(group, "citations.null.npy"))
+    assert nulls.tolist() == [False, False, True, False]
+    assert np.isnat(np.load(os.path.join(group, "published.npy"))[2])
+
+
+def test_columns_without_nulls_have_no_mask(tmp_path):
+    directory = str(tmp_path / "Year")
+    _write_columns(directory, {"year": "int"}, 2, iter([{"year": 2020}, {"year": 2021}]))
+    assert not os.path.exists(os.path.join(directory, "year.null.npy"))
+    assert _read_rows(directory, {"year": "int"}, 0, 2) == [{"year": 2020}, {"year": 2021}]
+
+
+def test_empty_group(tmp_path):
+    directory = str(tmp_path / "Empty")
+    _write_columns(directory, COLUMNS, 0, iter([]))
+    assert _read_rows(directory, COLUMNS, 0, 0) == []
+
+
+def test_row_count_mismatch_is_reported(tmp_path):
+    with pytest.raises(RuntimeError):
+        _write_columns(str(tmp_path / "Short"), {"year": "int"}, 2, iter([{"year": 2020}]))
+
+
+@pytest.mark.parametrize(
+    "property_types, kind",
+    [
+        (["String"], "str"),
+        (["Long"], "int"),
+        (["Long", "Double"], "float"),
+        (["Date"], "date"),
+        (["Point"], "json"),
+        (["DateTime"], "json"),
+        (["String", "Long"], "json"),
+    ],
+)
+def test_column_kind(property_types, kind):
+    assert _column_kind(property_types) == kind